@@ -1,10 +1,11 @@
 import os
 import json
 import time
+import threading
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
-from scanner import NetworkScanner
+from snapshot import SnapshotStore, snapshot_path_from_env
 
 # 환경 변수 로드
 load_dotenv()
@@ -16,12 +17,47 @@ CORS(app)
 DEBUG = os.getenv('DEBUG', 'False').lower() in ('true', '1', 't')
 PORT = int(os.getenv('PORT', 5000))
 HOST = os.getenv('HOST', '0.0.0.0')
+SNAPSHOT_PATH = snapshot_path_from_env()
 
-# 네트워크 스캐너 초기화
-scanner = NetworkScanner()
+# 네트워크 스캐너와 소모품 예측기는 처음 필요할 때 초기화
+# (puresnmp, requests, numpy 로딩을 읽기 전용 요청에서 피하기 위함)
+_scanner = None
+_forecaster = None
+_init_lock = threading.Lock()
 
-# 등록된 장치 목록 저장
-registered_devices = []
+# 등록된 장치 목록 (스냅샷에서 복원, 예측 상태는 예측기 초기화 시 복원)
+snapshot_store = SnapshotStore(SNAPSHOT_PATH)
+registered_devices = snapshot_store.load_devices()
+
+# 장치 목록/예측기 변경과 스냅샷 저장을 직렬화
+registry_lock = threading.RLock()
+
+def get_scanner():
+    """네트워크 스캐너 반환 (최초 호출 시 초기화)"""
+    global _scanner
+    if _scanner is None:
+        with _init_lock:
+            if _scanner is None:
+                from scanner import NetworkScanner
+                _scanner = NetworkScanner()
+    return _scanner
+
+def get_forecaster():
+    """소모품 소진 예측기 반환 (최초 호출 시 스냅샷 상태로 초기화, registry_lock 안에서 호출)"""
+    global _forecaster
+    if _forecaster is None:
+        with _init_lock:
+            if _forecaster is None:
+                from forecast import SupplyForecaster
+                forecaster = SupplyForecaster()
+                snapshot_store.load_forecast(forecaster)
+                _forecaster = forecaster
+    return _forecaster
+
+def compact_snapshot_if_needed():
+    """저널이 충분히 쌓였으면 스냅샷 파일로 압축 (registry_lock 안에서 호출)"""
+    if snapshot_store.needs_compaction():
+        snapshot_store.compact(registered_devices, get_forecaster().get_state())
 
 @app.route('/')
 def index():
@@ -42,35 +78,42 @@ def scan_device():
             }), 400
         
         # 스캔 실행
-        device_info = scanner.scan(ip_address)
+        device_info = get_scanner().scan(ip_address)
         
         if device_info:
-            # 이미 등록된 장치인지 확인
-            existing_device = next((d for d in registered_devices if d['ip'] == ip_address), None)
-            
-            if existing_device:
-                # 기존 장치 정보 업데이트
-                for key, value in device_info.items():
-                    existing_device[key] = value
-                existing_device['last_update'] = time.strftime("%Y-%m-%d %H:%M:%S")
+            with registry_lock:
+                # 소모품 예측용 샘플 추가
+                sample_time = time.time()
+                get_forecaster().add_sample(ip_address, device_info, timestamp=sample_time)
                 
-                return jsonify({
-                    'success': True,
-                    'message': f'장치 정보가 업데이트되었습니다: {device_info["name"]} ({ip_address})',
-                    'device': existing_device,
-                    'is_new': False
-                })
-            else:
-                # 새 장치 등록
-                device_info['last_update'] = time.strftime("%Y-%m-%d %H:%M:%S")
-                registered_devices.append(device_info)
+                # 이미 등록된 장치인지 확인
+                existing_device = next((d for d in registered_devices if d['ip'] == ip_address), None)
                 
-                return jsonify({
-                    'success': True,
-                    'message': f'새 장치가 등록되었습니다: {device_info["name"]} ({ip_address})',
-                    'device': device_info,
-                    'is_new': True
-                })
+                if existing_device:
+                    # 기존 장치 정보 업데이트
+                    for key, value in device_info.items():
+                        existing_device[key] = value
+                    existing_device['last_update'] = time.strftime("%Y-%m-%d %H:%M:%S")
+                    device_info = existing_device
+                    is_new = False
+                    message = f'장치 정보가 업데이트되었습니다: {device_info["name"]} ({ip_address})'
+                else:
+                    # 새 장치 등록
+                    device_info['last_update'] = time.strftime("%Y-%m-%d %H:%M:%S")
+                    registered_devices.append(device_info)
+                    is_new = True
+                    message = f'새 장치가 등록되었습니다: {device_info["name"]} ({ip_address})'
+                
+                snapshot_store.append_scan(ip_address, device_info, sample_time)
+                compact_snapshot_if_needed()
+                device_info = dict(device_info)
+            
+            return jsonify({
+                'success': True,
+                'message': message,
+                'device': device_info,
+                'is_new': is_new
+            })
         else:
             return jsonify({
                 'success': False,
@@ -85,9 +128,12 @@ def scan_device():
 @app.route('/api/devices', methods=['GET'])
 def get_devices():
     """등록된 장치 목록 반환"""
+    with registry_lock:
+        devices = [dict(d) for d in registered_devices]
+    
     return jsonify({
-        'devices': registered_devices,
-        'device_count': len(registered_devices)
+        'devices': devices,
+        'device_count': len(devices)
     })
 
 @app.route('/api/device/<ip>', methods=['GET'])
@@ -104,7 +150,7 @@ def get_device_details(ip):
             }), 404
             
         # 장치 상세 정보 가져오기
-        details = scanner.get_device_details(ip)
+        details = get_scanner().get_device_details(ip)
         
         return jsonify({
             'success': True,
@@ -121,26 +167,77 @@ def get_device_details(ip):
 def delete_device(ip):
     """등록된 장치 삭제"""
     try:
-        # IP 주소로 장치 찾기
-        device = next((d for d in registered_devices if d['ip'] == ip), None)
+        with registry_lock:
+            # IP 주소로 장치 찾기
+            device = next((d for d in registered_devices if d['ip'] == ip), None)
+            
+            if not device:
+                return jsonify({
+                    'success': False,
+                    'message': f'IP {ip}에 해당하는 장치를 찾을 수 없습니다.'
+                }), 404
+            
+            # 장치 삭제
+            registered_devices.remove(device)
+            if _forecaster is not None:
+                _forecaster.remove_device(ip)
+            snapshot_store.append_delete(ip)
+            compact_snapshot_if_needed()
         
-        if not device:
+        return jsonify({
+            'success': True,
+            'message': f'장치가 삭제되었습니다: {device["name"]} ({ip})'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'장치 삭제 중 오류 발생: {str(e)}'
+        }), 500
+
+@app.route('/api/forecast', methods=['GET'])
+def get_forecast():
+    """전체 장치의 소모품 소진 예측 반환"""
+    try:
+        with registry_lock:
+            forecast = get_forecaster().forecast()
+        
+        return jsonify({
+            'success': True,
+            'forecast': forecast
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'소모품 예측 중 오류 발생: {str(e)}'
+        }), 500
+
+@app.route('/api/device/<ip>/forecast', methods=['GET'])
+def get_device_forecast(ip):
+    """특정 장치의 소모품 소진 예측 반환"""
+    try:
+        with registry_lock:
+            forecast = get_forecaster().forecast_device(ip)
+            registered = any(d['ip'] == ip for d in registered_devices)
+        
+        if not forecast:
+            if registered:
+                message = f'IP {ip} 장치는 아직 수집된 샘플이 없습니다.'
+            else:
+                message = f'IP {ip}에 해당하는 장치를 찾을 수 없습니다.'
             return jsonify({
                 'success': False,
-                'message': f'IP {ip}에 해당하는 장치를 찾을 수 없습니다.'
+                'message': message
             }), 404
         
-        # 장치 삭제
-        registered_devices.remove(device)
-        
         return jsonify({
             'success': True,
-            'message': f'장치가 삭제되었습니다: {device["name"]} ({ip})'
+            'ip': ip,
+            'forecast': forecast
         })
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': f'장치 삭제 중 오류 발생: {str(e)}'
+            'message': f'소모품 예측 중 오류 발생: {str(e)}'
         }), 500
 
 if __name__ == '__main__':
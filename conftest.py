@@ -0,0 +1 @@
+# 저장소 루트를 import 경로에 추가해 `pytest`로 바로 테스트를 실행할 수 있도록 함
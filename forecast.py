@@ -0,0 +1,415 @@
+import time
+import numpy as np
+
+
+class SupplyForecaster:
+    """소모품 소진 예측 클래스"""
+
+    # 예측 대상 시계열 (토너 색상별 잔량 + 총 인쇄 매수)
+    SUPPLIES = ['black', 'cyan', 'magenta', 'yellow']
+    SERIES = SUPPLIES + ['page_count']
+
+    def __init__(self, capacity=64, refill_threshold=10.0, min_span_days=1.0):
+        """
+        소모품 예측기 초기화
+
+        장치(행) x 시계열(열) 형태의 배열에 최소제곱 회귀용 누적합을 보관하고,
+        예측은 전체 장치에 대해 한 번의 벡터 연산으로 계산합니다.
+
+        Args:
+            capacity (int): 초기 장치 수용량 (부족하면 2배씩 확장)
+            refill_threshold (float): 토너 교체로 간주할 잔량 증가폭 (%)
+            min_span_days (float): 기울기를 보고하기 위한 최소 샘플 기간 (일)
+        """
+        self.refill_threshold = refill_threshold
+        self.min_span_days = min_span_days
+
+        # IP 주소 -> 행 번호
+        self._rows = {}
+        self._free_rows = []
+        self._size = 0
+
+        self._allocate(max(int(capacity), 1))
+
+        # 마지막 예측 결과 캐시 (새 샘플이 들어오면 무효화)
+        self._cache = None
+
+    def _allocate(self, capacity):
+        """
+        누적합 배열 할당 (기존 값은 유지)
+
+        Args:
+            capacity (int): 새 장치 수용량
+        """
+        shape = (capacity, len(self.SERIES))
+        old = getattr(self, '_n', None)
+
+        n = np.zeros(shape)
+        sum_t = np.zeros(shape)
+        sum_y = np.zeros(shape)
+        sum_tt = np.zeros(shape)
+        sum_ty = np.zeros(shape)
+        t0 = np.full(shape, np.nan)
+        last_t = np.full(shape, np.nan)
+        last_y = np.full(shape, np.nan)
+
+        if old is not None:
+            rows = old.shape[0]
+            n[:rows] = self._n
+            sum_t[:rows] = self._sum_t
+            sum_y[:rows] = self._sum_y
+            sum_tt[:rows] = self._sum_tt
+            sum_ty[:rows] = self._sum_ty
+            t0[:rows] = self._t0
+            last_t[:rows] = self._last_t
+            last_y[:rows] = self._last_y
+
+        self._n = n
+        self._sum_t = sum_t
+        self._sum_y = sum_y
+        self._sum_tt = sum_tt
+        self._sum_ty = sum_ty
+        self._t0 = t0
+        self._last_t = last_t
+        self._last_y = last_y
+
+    def _row_for(self, ip):
+        """
+        IP 주소에 해당하는 행 번호 반환 (없으면 새로 배정)
+
+        Args:
+            ip (str): 장치 IP 주소
+
+        Returns:
+            int: 행 번호
+        """
+        row = self._rows.get(ip)
+        if row is not None:
+            return row
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            if self._size >= self._n.shape[0]:
+                self._allocate(self._n.shape[0] * 2)
+            row = self._size
+            self._size += 1
+
+        self._rows[ip] = row
+        return row
+
+    def _reset_cells(self, row, mask):
+        """
+        지정한 행의 시계열 누적합 초기화
+
+        Args:
+            row (int): 행 번호
+            mask (numpy.ndarray): 초기화할 열 (bool 배열)
+        """
+        for arr in (self._n, self._sum_t, self._sum_y, self._sum_tt, self._sum_ty):
+            arr[row, mask] = 0.0
+        for arr in (self._t0, self._last_t, self._last_y):
+            arr[row, mask] = np.nan
+
+    @classmethod
+    def _extract_values(cls, device_info):
+        """
+        스캐너가 수집한 장치 정보에서 시계열 값 추출
+
+        스캐너는 SNMP 조회에 실패한 값을 None으로 보고하므로 None은 누락값(NaN)으로,
+        0은 실제 측정값(토너 소진)으로 처리합니다.
+
+        Args:
+            device_info (dict): NetworkScanner가 반환한 장치 정보
+
+        Returns:
+            numpy.ndarray: 시계열별 값 (값이 없으면 NaN)
+        """
+        values = np.full(len(cls.SERIES), np.nan)
+        toner = device_info.get('toner') or {}
+
+        for i, color in enumerate(cls.SUPPLIES):
+            try:
+                values[i] = float(toner[color]['percent'])
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        try:
+            values[-1] = float(device_info['page_count'])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        return values
+
+    def add_sample(self, ip, device_info, timestamp=None):
+        """
+        장치 샘플 추가 (누적합만 갱신하므로 O(1))
+
+        Args:
+            ip (str): 장치 IP 주소
+            device_info (dict): NetworkScanner가 반환한 장치 정보
+            timestamp (float): 샘플 시각 (유닉스 시간, 기본값은 현재 시각)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        values = self._extract_values(device_info)
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return
+
+        row = self._row_for(ip)
+
+        last_y = self._last_y[row]
+        has_last = ~np.isnan(last_y)
+
+        # 토너 교체(잔량 급증) 또는 카운터 초기화(매수 감소) 시 시계열 재시작
+        reset = np.zeros(len(self.SERIES), dtype=bool)
+        reset[:-1] = values[:-1] - last_y[:-1] > self.refill_threshold
+        reset[-1] = values[-1] < last_y[-1]
+        reset &= valid & has_last
+        if reset.any():
+            self._reset_cells(row, reset)
+
+        # 시계열별 첫 샘플 시각을 기준으로 일(day) 단위 시간 계산
+        start = valid & np.isnan(self._t0[row])
+        self._t0[row, start] = timestamp
+
+        t = (timestamp - self._t0[row]) / 86400.0
+        t = np.where(valid, t, 0.0)
+        y = np.where(valid, values, 0.0)
+        w = valid.astype(float)
+
+        self._n[row] += w
+        self._sum_t[row] += t * w
+        self._sum_y[row] += y * w
+        self._sum_tt[row] += t * t * w
+        self._sum_ty[row] += t * y * w
+        self._last_t[row, valid] = timestamp
+        self._last_y[row, valid] = values[valid]
+
+        self._cache = None
+
+    def remove_device(self, ip):
+        """
+        장치의 샘플 기록 삭제
+
+        Args:
+            ip (str): 장치 IP 주소
+        """
+        row = self._rows.pop(ip, None)
+        if row is None:
+            return
+
+        self._reset_cells(row, np.ones(len(self.SERIES), dtype=bool))
+        self._free_rows.append(row)
+        self._cache = None
+
+    def _fit(self, rows):
+        """
+        지정한 행들의 시계열 기울기(일당 변화량) 계산
+
+        Args:
+            rows (numpy.ndarray): 계산할 행 번호 배열
+
+        Returns:
+            numpy.ndarray: 행 x 시계열 기울기 (계산 불가 시 NaN)
+        """
+        n = self._n[rows]
+        sum_t = self._sum_t[rows]
+        sum_y = self._sum_y[rows]
+
+        denom = n * self._sum_tt[rows] - sum_t * sum_t
+        numer = n * self._sum_ty[rows] - sum_t * sum_y
+
+        # 샘플 기간이 너무 짧으면 (예: 수동 재스캔) 기울기를 신뢰할 수 없음
+        span = (self._last_t[rows] - self._t0[rows]) / 86400.0
+        enough_span = np.nan_to_num(span, nan=0.0) >= self.min_span_days
+
+        slope = np.full(n.shape, np.nan)
+        ok = (n >= 2) & (denom > 1e-12) & enough_span
+        np.divide(numer, denom, out=slope, where=ok)
+        return slope
+
+    def _forecast_rows(self, ips, rows):
+        """
+        지정한 장치들의 예측 결과 계산
+
+        수치 계산과 반올림, NaN 변환은 배열 단위로 처리하고,
+        장치별로는 완성된 목록을 딕셔너리로 묶기만 합니다.
+
+        Args:
+            ips (list): 장치 IP 주소 목록
+            rows (numpy.ndarray): IP 주소 순서에 대응하는 행 번호 배열
+
+        Returns:
+            dict: IP 주소 -> 예측 정보
+        """
+        slope = self._fit(rows)
+        last_y = self._last_y[rows]
+        n = self._n[rows].astype(int)
+
+        # 토너 잔량이 감소 중인 경우에만 소모량과 소진까지 남은 일수 계산
+        toner_slope = slope[:, :-1]
+        percent = last_y[:, :-1]
+        depleting = toner_slope < 0
+        depletion = np.where(depleting, -toner_slope, np.nan)
+        days = np.full(toner_slope.shape, np.nan)
+        np.divide(percent, depletion, out=days, where=depleting)
+
+        # 마지막 측정값이 0%이면 이미 소진된 것으로 보고
+        days[percent == 0] = 0.0
+
+        percent = _to_lists(percent)
+        depletion = _to_lists(depletion)
+        days = _to_lists(days)
+        pages_per_day = _to_lists(slope[:, -1])
+        n = n.tolist()
+
+        result = {}
+        for k, ip in enumerate(ips):
+            result[ip] = {
+                'supplies': {
+                    color: {
+                        'percent': percent[k][i],
+                        'depletion_per_day': depletion[k][i],
+                        'days_to_empty': days[k][i],
+                        'samples': n[k][i]
+                    }
+                    for i, color in enumerate(self.SUPPLIES)
+                },
+                'pages_per_day': pages_per_day[k],
+                'samples': n[k][-1]
+            }
+
+        return result
+
+    def forecast(self):
+        """
+        전체 장치의 소모품 소진 예측 결과 반환
+
+        Returns:
+            dict: IP 주소 -> 예측 정보
+        """
+        if self._cache is None:
+            ips = list(self._rows)
+            rows = np.fromiter(self._rows.values(), dtype=int, count=len(ips))
+            self._cache = self._forecast_rows(ips, rows)
+        return self._cache
+
+    def forecast_device(self, ip):
+        """
+        특정 장치의 소모품 소진 예측 결과 반환
+
+        캐시가 없으면 전체가 아닌 해당 장치만 계산합니다.
+
+        Args:
+            ip (str): 장치 IP 주소
+
+        Returns:
+            dict: 예측 정보 (기록이 없으면 None)
+        """
+        if self._cache is not None:
+            return self._cache.get(ip)
+
+        row = self._rows.get(ip)
+        if row is None:
+            return None
+        return self._forecast_rows([ip], np.array([row]))[ip]
+
+    # 스냅샷에 저장하는 누적합 배열 (속성 이름 -> 저장 키)
+    _STATE_FIELDS = {
+        '_n': 'n',
+        '_sum_t': 'sum_t',
+        '_sum_y': 'sum_y',
+        '_sum_tt': 'sum_tt',
+        '_sum_ty': 'sum_ty',
+        '_t0': 't0',
+        '_last_t': 'last_t',
+        '_last_y': 'last_y'
+    }
+
+    def get_state(self):
+        """
+        스냅샷 저장용 누적합 상태 반환
+
+        Returns:
+            dict: 'ips'(IP 주소 목록)와 저장 키별 행 x 시계열 값 목록 (NaN은 None)
+        """
+        ips = list(self._rows)
+        rows = np.fromiter(self._rows.values(), dtype=int, count=len(ips))
+
+        state = {'ips': ips}
+        for attr, key in self._STATE_FIELDS.items():
+            state[key] = _to_lists(getattr(self, attr)[rows], decimals=None)
+        return state
+
+    def load_state(self, state):
+        """
+        스냅샷에서 누적합 상태 복원
+
+        Args:
+            state (dict): get_state()가 반환한 형식의 상태
+        """
+        if not state:
+            return
+
+        # 이전 형식 (IP 주소 -> 저장 키별 값 목록)
+        if 'ips' not in state:
+            state = _columns_from_legacy_state(state, self._STATE_FIELDS.values())
+
+        ips = state['ips']
+        shape = (len(ips), len(self.SERIES))
+        try:
+            # None은 float 변환 시 NaN이 됨
+            values = {
+                attr: np.array(state[key], dtype=float).reshape(shape)
+                for attr, key in self._STATE_FIELDS.items()
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"예측 상태 복원 실패: {str(e)}")
+            return
+
+        rows = np.array([self._row_for(ip) for ip in ips], dtype=int)
+        for attr, v in values.items():
+            getattr(self, attr)[rows] = v
+
+        self._cache = None
+
+
+def _columns_from_legacy_state(state, keys):
+    """
+    IP 주소별 예측 상태를 열 단위 형식으로 변환
+
+    Args:
+        state (dict): IP 주소 -> 저장 키별 값 목록
+        keys (iterable): 저장 키 목록
+
+    Returns:
+        dict: get_state()와 같은 열 단위 형식의 상태
+    """
+    entries = [(ip, fields) for ip, fields in state.items()
+               if isinstance(fields, dict) and all(key in fields for key in keys)]
+
+    columns = {'ips': [ip for ip, _ in entries]}
+    for key in keys:
+        columns[key] = [fields[key] for _, fields in entries]
+    return columns
+
+
+def _to_lists(values, decimals=2):
+    """
+    NumPy 배열을 JSON 직렬화 가능한 중첩 목록으로 변환
+
+    Args:
+        values (numpy.ndarray): 변환할 배열
+        decimals (int): 반올림할 소수점 자릿수 (None이면 반올림하지 않음)
+
+    Returns:
+        list: 값 목록 (NaN/무한대는 None)
+    """
+    if decimals is not None:
+        values = np.round(values, decimals)
+    converted = values.astype(object)
+    converted[~np.isfinite(values)] = None
+    return converted.tolist()
@@ -269,13 +269,13 @@ class NetworkScanner:
         # 토너 정보 가져오기
         toner_info = self._get_toner_info(ip, manufacturer, oids)
         
-        # 페이지 카운터 (총 인쇄 매수)
+        # 페이지 카운터 (총 인쇄 매수, 조회 실패 시 None)
         page_count = self._get_snmp_value(ip, oids['page_count'])
         try:
             page_count = int(page_count)
             print(f"총 인쇄 매수: {page_count}")
         except:
-            page_count = 0
+            page_count = None
             print("총 인쇄 매수를 가져올 수 없습니다.")
         
         # 상태 확인
@@ -411,11 +411,12 @@ class NetworkScanner:
         """
         print(f"토너 정보 수집 중 ({manufacturer})...")
         
+        # 조회에 실패한 토너는 None으로 남겨 실제 0%(소진)와 구분
         toner_info = {
-            'black': {'level': 0, 'max': 100, 'percent': 0},
-            'cyan': {'level': 0, 'max': 100, 'percent': 0},
-            'magenta': {'level': 0, 'max': 100, 'percent': 0},
-            'yellow': {'level': 0, 'max': 100, 'percent': 0}
+            'black': {'level': None, 'max': None, 'percent': None},
+            'cyan': {'level': None, 'max': None, 'percent': None},
+            'magenta': {'level': None, 'max': None, 'percent': None},
+            'yellow': {'level': None, 'max': None, 'percent': None}
         }
         
         # 토너 색상별 처리
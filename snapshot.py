@@ -0,0 +1,330 @@
+import os
+import json
+import tempfile
+import threading
+
+# 서버리스 플랫폼이 설정하는 환경 변수
+SERVERLESS_ENV_VARS = ('VERCEL', 'AWS_LAMBDA_FUNCTION_NAME')
+
+
+def default_snapshot_path():
+    """
+    기본 스냅샷 파일 경로 반환
+
+    시스템 임시 디렉터리에 저장하므로 같은 서버에서 프로세스를 재시작할 때만
+    유지됩니다. 서버리스 환경에서는 인스턴스마다 임시 디렉터리가 따로 있고
+    콜드 스타트마다 비워집니다.
+
+    Returns:
+        str: 스냅샷 파일 경로
+    """
+    return os.path.join(tempfile.gettempdir(), 'printer_scanner_devices.json')
+
+
+def snapshot_path_from_env():
+    """
+    환경 변수에서 스냅샷 파일 경로 결정
+
+    서버리스 환경에서 SNAPSHOT_PATH가 없으면 경고를 출력하고 기본 경로를
+    사용합니다 (이 경우 콜드 스타트 사이에 장치 목록이 유지되지 않음).
+
+    Returns:
+        str: SNAPSHOT_PATH 값 (없으면 기본 경로)
+    """
+    path = os.getenv('SNAPSHOT_PATH')
+    if path:
+        return path
+
+    path = default_snapshot_path()
+    if any(os.getenv(name) for name in SERVERLESS_ENV_VARS):
+        print(f"경고: 서버리스 환경에서 SNAPSHOT_PATH가 설정되지 않아 {path}에 저장합니다. "
+              "이 경로는 인스턴스별 임시 저장소이므로 콜드 스타트 후에는 장치 목록이 유지되지 않습니다.")
+    return path
+
+
+class SnapshotStore:
+    """장치 목록/소모품 예측 스냅샷 저장소"""
+
+    def __init__(self, path, compact_every=500):
+        """
+        스냅샷 저장소 초기화
+
+        변경 사항은 저널 파일에 한 줄씩 추가하고, compact_every건마다
+        장치 목록 파일과 예측 상태 파일을 다시 써서 저널을 비웁니다.
+        예측 상태는 별도 파일이므로 예측기가 필요할 때만 읽습니다.
+
+        Args:
+            path (str): 장치 목록 스냅샷 파일 경로
+            compact_every (int): 저널을 압축할 변경 건수
+        """
+        root, ext = os.path.splitext(path)
+        ext = ext or '.json'
+
+        self.path = path
+        self.forecast_path = f"{root}.forecast{ext}"
+        self.journal_path = f"{root}.journal"
+        self.compact_every = compact_every
+
+        self._lock = threading.Lock()
+        self._seq = 0       # 마지막으로 기록한 저널 번호
+        self._base_seq = 0  # 마지막 압축 시점의 저널 번호
+
+    def load_devices(self):
+        """
+        저장된 장치 목록 불러오기 (스냅샷 + 저널 재적용)
+
+        Returns:
+            list: 장치 정보 목록 (파일이 없거나 손상되었으면 빈 목록)
+        """
+        snapshot = _read_json(self.path)
+
+        # 이전 형식 (장치 목록만 저장)
+        if isinstance(snapshot, list):
+            snapshot = {'devices': snapshot}
+
+        if snapshot is None:
+            snapshot = {}
+        elif not isinstance(snapshot, dict) or not isinstance(snapshot.get('devices'), list):
+            print(f"스냅샷 형식이 올바르지 않습니다 ({self.path}).")
+            snapshot = {}
+
+        base_seq = _to_seq(snapshot.get('seq'))
+        devices = {
+            d['ip']: d for d in snapshot.get('devices', [])
+            if isinstance(d, dict) and 'ip' in d
+        }
+
+        last_seq = base_seq
+        for entry in self._read_journal():
+            last_seq = max(last_seq, entry['seq'])
+            if entry['seq'] <= base_seq:
+                continue
+            if entry['op'] == 'scan':
+                devices[entry['ip']] = entry['device']
+            elif entry['op'] == 'delete':
+                devices.pop(entry['ip'], None)
+
+        with self._lock:
+            self._base_seq = base_seq
+            self._seq = last_seq
+
+        return list(devices.values())
+
+    def load_forecast(self, forecaster):
+        """
+        저장된 소모품 예측 상태를 예측기에 복원 (스냅샷 + 저널 재적용)
+
+        Args:
+            forecaster (SupplyForecaster): 상태를 복원할 예측기
+        """
+        snapshot = _read_json(self.forecast_path)
+
+        if snapshot is None:
+            # 이전 형식 (장치 목록 파일에 예측 상태를 함께 저장)
+            legacy = _read_json(self.path)
+            snapshot = legacy if isinstance(legacy, dict) else {}
+
+        if not isinstance(snapshot, dict) or not isinstance(snapshot.get('forecast', {}), dict):
+            print(f"예측 스냅샷 형식이 올바르지 않습니다 ({self.forecast_path}).")
+            snapshot = {}
+
+        base_seq = _to_seq(snapshot.get('seq'))
+        forecaster.load_state(snapshot.get('forecast'))
+
+        for entry in self._read_journal():
+            if entry['seq'] <= base_seq:
+                continue
+            if entry['op'] == 'scan':
+                forecaster.add_sample(entry['ip'], entry['device'], timestamp=entry.get('t'))
+            elif entry['op'] == 'delete':
+                forecaster.remove_device(entry['ip'])
+
+    def append_scan(self, ip, device, timestamp):
+        """
+        장치 스캔 결과를 저널에 추가
+
+        Args:
+            ip (str): 장치 IP 주소
+            device (dict): 등록된 장치 정보
+            timestamp (float): 예측기에 추가한 샘플 시각
+
+        Returns:
+            bool: 기록에 성공하면 True, 아니면 False
+        """
+        return self._append({'op': 'scan', 'ip': ip, 't': timestamp, 'device': device})
+
+    def append_delete(self, ip):
+        """
+        장치 삭제를 저널에 추가
+
+        Args:
+            ip (str): 장치 IP 주소
+
+        Returns:
+            bool: 기록에 성공하면 True, 아니면 False
+        """
+        return self._append({'op': 'delete', 'ip': ip})
+
+    def needs_compaction(self):
+        """
+        저널 압축이 필요한지 확인
+
+        Returns:
+            bool: 마지막 압축 이후 변경 건수가 compact_every 이상이면 True
+        """
+        return self._seq - self._base_seq >= self.compact_every
+
+    def compact(self, devices, forecast_state):
+        """
+        장치 목록과 예측 상태를 스냅샷 파일로 저장하고 저널 비우기
+
+        두 파일 모두 저장에 성공한 경우에만 저널을 비우므로, 중간에 실패해도
+        다음 시작 시 저널을 다시 적용해 복원할 수 있습니다.
+
+        Args:
+            devices (list): 장치 정보 목록
+            forecast_state (dict): 소모품 예측 상태 (SupplyForecaster.get_state())
+
+        Returns:
+            bool: 저장에 성공하면 True, 아니면 False
+        """
+        with self._lock:
+            seq = self._seq
+            saved = (
+                _write_json_atomic(self.path, {'seq': seq, 'devices': devices}) and
+                _write_json_atomic(self.forecast_path, {'seq': seq, 'forecast': forecast_state or {}})
+            )
+            if not saved:
+                return False
+
+            try:
+                open(self.journal_path, 'w').close()
+            except OSError as e:
+                print(f"저널 초기화 실패 ({self.journal_path}): {str(e)}")
+                return False
+
+            self._base_seq = seq
+            return True
+
+    def _append(self, entry):
+        """
+        저널에 변경 사항 한 줄 추가
+
+        Args:
+            entry (dict): 저널 항목
+
+        Returns:
+            bool: 기록에 성공하면 True, 아니면 False
+        """
+        with self._lock:
+            entry['seq'] = self._seq + 1
+            try:
+                line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+            except (OSError, TypeError, ValueError) as e:
+                print(f"저널 기록 실패 ({self.journal_path}): {str(e)}")
+                return False
+
+            self._seq = entry['seq']
+            return True
+
+    def _read_journal(self):
+        """
+        저널 항목 읽기 (손상된 줄은 건너뜀)
+
+        Returns:
+            list: 저널 항목 목록
+        """
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            print(f"저널 불러오기 실패 ({self.journal_path}): {str(e)}")
+            return []
+
+        entries = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if (isinstance(entry, dict) and isinstance(entry.get('seq'), int)
+                    and isinstance(entry.get('ip'), str)
+                    and (entry.get('op') == 'delete' or
+                         (entry.get('op') == 'scan' and isinstance(entry.get('device'), dict)))):
+                entries.append(entry)
+        return entries
+
+
+def _to_seq(value):
+    """
+    스냅샷의 저널 번호 정규화
+
+    Args:
+        value: 스냅샷에 저장된 값
+
+    Returns:
+        int: 저널 번호 (없거나 잘못된 값이면 0)
+    """
+    return value if isinstance(value, int) else 0
+
+
+def _read_json(path):
+    """
+    JSON 파일 읽기
+
+    Args:
+        path (str): 파일 경로
+
+    Returns:
+        object: 읽은 값 (파일이 없거나 손상되었으면 None)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"스냅샷 불러오기 실패 ({path}): {str(e)}")
+        return None
+
+
+def _write_json_atomic(path, payload):
+    """
+    JSON 파일을 원자적으로 저장
+
+    같은 디렉터리의 고유한 임시 파일에 먼저 기록한 뒤 교체하므로 저장 도중
+    중단되어도 기존 파일이 손상되지 않습니다.
+
+    Args:
+        path (str): 파일 경로
+        payload (object): 저장할 값
+
+    Returns:
+        bool: 저장에 성공하면 True, 아니면 False
+    """
+    tmp_path = None
+    try:
+        data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)),
+            prefix=os.path.basename(path),
+            suffix='.tmp'
+        )
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"스냅샷 저장 실패 ({path}): {str(e)}")
+        return False
+    finally:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
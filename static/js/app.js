@@ -1,5 +1,23 @@
 // 전역 변수
 let devices = [];
+let visibleDevices = [];
+
+// 장치 목록 렌더링 상태 (보이는 행만 그리고, 변경된 행만 다시 생성)
+const ROW_OVERSCAN = 10;
+const FILTER_DEBOUNCE_MS = 150;
+const RESIZE_DEBOUNCE_MS = 150;
+const ROW_HEIGHT_FALLBACK = 48;   // 첫 행을 측정하기 전에만 사용
+const rowCache = new Map();     // IP -> { device, signature, row } (화면에 나타난 행만)
+const rowHeights = new Map();   // IP -> 실제 측정된 행 높이
+let rowOffsets = new Float64Array(1);
+let renderedRange = null;
+let renderScheduled = false;
+let filterTimer = null;
+let resizeTimer = null;
+
+// 종류별(흑백/컬러) 행 높이 추정값: 해당 종류의 첫 측정 행에서 가져옴
+const rowHeightEstimates = { mono: 0, color: 0 };
+const staleRowHeightEstimates = new Set();
 let settings = {
     snmpCommunity: 'public',
     snmpVersion: 2
@@ -15,7 +33,12 @@ document.addEventListener('DOMContentLoaded', function() {
     document.getElementById('refresh-btn').addEventListener('click', refreshDevices);
     document.getElementById('save-settings').addEventListener('click', saveSettings);
     document.getElementById('export-btn').addEventListener('click', exportToExcel);
-    document.getElementById('search-input').addEventListener('input', filterDevices);
+    document.getElementById('search-input').addEventListener('input', scheduleFilterDevices);
+    document.getElementById('devices-scroll').addEventListener('scroll', scheduleRenderRows);
+    window.addEventListener('resize', handleDevicesResize);
+    
+    // 행/버튼 클릭은 tbody에서 한 번에 처리 (행마다 리스너를 등록하지 않음)
+    document.getElementById('devices-list').addEventListener('click', handleDeviceListClick);
     
     // IP 주소 입력 필드에서 Enter 키 이벤트 처리
     document.getElementById('ip-address-input').addEventListener('keypress', function(e) {
@@ -64,7 +87,8 @@ function loadDevices() {
         .then(response => response.json())
         .then(data => {
             devices = data.devices;
-            displayDevices(devices);
+            syncRowCache();
+            filterDevices();
         })
         .catch(error => {
             console.error('장치 목록 로드 오류:', error);
@@ -156,9 +180,11 @@ function isValidIpAddress(ipAddress) {
 // 장치 목록 표시
 function displayDevices(devicesList) {
     const tbody = document.getElementById('devices-list');
+    visibleDevices = devicesList || [];
+    renderedRange = null;
     
     // 데이터가 없으면 비어있는 메시지 표시
-    if (!devicesList || devicesList.length === 0) {
+    if (visibleDevices.length === 0) {
         tbody.innerHTML = `
             <tr>
                 <td colspan="8" class="text-center py-5">
@@ -169,85 +195,268 @@ function displayDevices(devicesList) {
         return;
     }
     
-    // 장치 목록 생성
-    let html = '';
-    devicesList.forEach((device, index) => {
-        // 상태 아이콘 결정
-        let statusClass = 'status-online';
-        let statusText = '온라인';
+    updateRowOffsets();
+    renderVisibleRows();
+}
+
+// 새로 받은 장치 목록에서 사라진 장치의 행 캐시 정리
+function syncRowCache() {
+    const currentIps = new Set(devices.map(device => device.ip));
+    
+    rowCache.forEach((entry, ip) => {
+        if (!currentIps.has(ip)) {
+            rowCache.delete(ip);
+            rowHeights.delete(ip);
+        }
+    });
+}
+
+// 장치 행 반환 (처음 보이거나 장치 데이터가 바뀐 경우에만 생성)
+function getDeviceRow(device) {
+    const cached = rowCache.get(device.ip);
+    if (cached && cached.device === device) {
+        return cached.row;
+    }
+    
+    // 새로고침으로 받은 객체는 내용이 같으면 기존 행을 그대로 사용
+    const signature = JSON.stringify(device);
+    if (cached && cached.signature === signature) {
+        cached.device = device;
+        return cached.row;
+    }
+    
+    const row = createDeviceRow(device);
+    rowCache.set(device.ip, { device: device, signature: signature, row: row });
+    rowHeights.delete(device.ip);
+    return row;
+}
+
+// 장치 행 생성
+function createDeviceRow(device) {
+    // 상태 아이콘 결정
+    let statusClass = 'status-online';
+    let statusText = '온라인';
+    
+    if (device.status && device.status.toLowerCase() === 'offline') {
+        statusClass = 'status-offline';
+        statusText = '오프라인';
+    } else if (device.status && device.status.toLowerCase() === 'warning') {
+        statusClass = 'status-warning';
+        statusText = '경고';
+    }
+    
+    // 토너 상태 HTML 생성
+    const tonerHtml = generateTonerHtml(device.toner);
+    
+    // 행 HTML 생성
+    const template = document.createElement('tbody');
+    template.innerHTML = `
+        <tr class="clickable-row" data-ip="${device.ip}">
+            <td>
+                <span class="status-indicator ${statusClass}"></span>
+                ${statusText}
+            </td>
+            <td class="row-index"></td>
+            <td>${device.name || '알 수 없음'}</td>
+            <td>${device.model || '알 수 없음'}</td>
+            <td>${device.serial || '알 수 없음'}</td>
+            <td>${device.ip}</td>
+            <td>${tonerHtml}</td>
+            <td>
+                <button class="btn btn-sm btn-outline-primary me-1 view-device" data-ip="${device.ip}" title="상세 정보">
+                    <i class="bi bi-info-circle"></i>
+                </button>
+                <button class="btn btn-sm btn-outline-danger delete-device" data-ip="${device.ip}" title="삭제">
+                    <i class="bi bi-trash"></i>
+                </button>
+            </td>
+        </tr>
+    `;
+    
+    return template.firstElementChild;
+}
+
+// 행 종류 (컬러 토너가 있으면 토너 막대 4개로 행이 더 높음)
+function getRowKind(device) {
+    const toner = device.toner;
+    const hasColor = toner && (toner.cyan.percent > 0 || toner.magenta.percent > 0 || toner.yellow.percent > 0);
+    return hasColor ? 'color' : 'mono';
+}
+
+// 측정 전 행 높이 추정 (같은 종류의 측정값, 없으면 다른 종류의 측정값 사용)
+function estimateRowHeight(device) {
+    return rowHeightEstimates[getRowKind(device)] ||
+        rowHeightEstimates.mono || rowHeightEstimates.color || ROW_HEIGHT_FALLBACK;
+}
+
+// 각 행의 시작 위치(누적 높이) 계산
+function updateRowOffsets() {
+    rowOffsets = new Float64Array(visibleDevices.length + 1);
+    
+    for (let i = 0; i < visibleDevices.length; i++) {
+        const device = visibleDevices[i];
+        const height = rowHeights.get(device.ip) || estimateRowHeight(device);
+        rowOffsets[i + 1] = rowOffsets[i] + height;
+    }
+}
+
+// 위치가 속한 행 번호 찾기 (이진 탐색)
+function findRowIndex(offset) {
+    let low = 0;
+    let high = visibleDevices.length - 1;
+    
+    while (low < high) {
+        const mid = (low + high + 1) >> 1;
+        if (rowOffsets[mid] <= offset) {
+            low = mid;
+        } else {
+            high = mid - 1;
+        }
+    }
+    
+    return low;
+}
+
+// 스크롤/크기 변경 시 다음 프레임에 한 번만 렌더링
+function scheduleRenderRows() {
+    if (renderScheduled) {
+        return;
+    }
+    
+    renderScheduled = true;
+    requestAnimationFrame(() => {
+        renderScheduled = false;
+        renderVisibleRows();
+    });
+}
+
+// 창 크기 변경 처리 (크기 조절이 멈춘 뒤 한 번만 측정값을 버리고 다시 렌더링)
+function handleDevicesResize() {
+    clearTimeout(resizeTimer);
+    resizeTimer = setTimeout(() => {
+        rowHeights.clear();
         
-        if (device.status && device.status.toLowerCase() === 'offline') {
-            statusClass = 'status-offline';
-            statusText = '오프라인';
-        } else if (device.status && device.status.toLowerCase() === 'warning') {
-            statusClass = 'status-warning';
-            statusText = '경고';
+        // 추정값은 새 크기에서 다시 측정될 때까지 이전 값을 유지
+        staleRowHeightEstimates.add('mono');
+        staleRowHeightEstimates.add('color');
+        
+        updateRowOffsets();
+        renderedRange = null;
+        scheduleRenderRows();
+    }, RESIZE_DEBOUNCE_MS);
+}
+
+// 화면에 보이는 행만 렌더링
+function renderVisibleRows() {
+    if (visibleDevices.length === 0) {
+        return;
+    }
+    
+    const tbody = document.getElementById('devices-list');
+    const { start, end } = getVisibleRange();
+    
+    if (renderedRange && renderedRange.start === start && renderedRange.end === end) {
+        return;
+    }
+    renderedRange = { start: start, end: end };
+    
+    // 보이는 행만 생성(또는 캐시에서 재사용)하고 번호 칸 갱신
+    const topSpacer = createSpacerRow(rowOffsets[start]);
+    const bottomSpacer = createSpacerRow(rowOffsets[visibleDevices.length] - rowOffsets[end]);
+    const rows = [topSpacer];
+    
+    for (let i = start; i < end; i++) {
+        const row = getDeviceRow(visibleDevices[i]);
+        row.querySelector('.row-index').textContent = i + 1;
+        rows.push(row);
+    }
+    rows.push(bottomSpacer);
+    
+    tbody.replaceChildren(...rows);
+    
+    // 실제 행 높이를 측정해 추정값 보정
+    let measured = false;
+    for (let i = start; i < end; i++) {
+        const device = visibleDevices[i];
+        const height = rows[i - start + 1].offsetHeight;
+        if (height > 0 && rowHeights.get(device.ip) !== height) {
+            rowHeights.set(device.ip, height);
+            measured = true;
         }
         
-        // 토너 상태 HTML 생성
-        const tonerHtml = generateTonerHtml(device.toner);
+        // 종류별 첫 측정 행으로 추정값 설정
+        const kind = getRowKind(device);
+        if (height > 0 && (!rowHeightEstimates[kind] || staleRowHeightEstimates.has(kind))) {
+            rowHeightEstimates[kind] = height;
+            staleRowHeightEstimates.delete(kind);
+            measured = true;
+        }
+    }
+    
+    if (measured) {
+        updateRowOffsets();
+        topSpacer.firstElementChild.style.height = `${rowOffsets[start]}px`;
+        bottomSpacer.firstElementChild.style.height = `${rowOffsets[visibleDevices.length] - rowOffsets[end]}px`;
         
-        // 행 HTML 생성
-        html += `
-            <tr class="clickable-row" data-ip="${device.ip}">
-                <td>
-                    <span class="status-indicator ${statusClass}"></span>
-                    ${statusText}
-                </td>
-                <td>${index + 1}</td>
-                <td>${device.name || '알 수 없음'}</td>
-                <td>${device.model || '알 수 없음'}</td>
-                <td>${device.serial || '알 수 없음'}</td>
-                <td>${device.ip}</td>
-                <td>${tonerHtml}</td>
-                <td>
-                    <button class="btn btn-sm btn-outline-primary me-1 view-device" data-ip="${device.ip}" title="상세 정보">
-                        <i class="bi bi-info-circle"></i>
-                    </button>
-                    <button class="btn btn-sm btn-outline-danger delete-device" data-ip="${device.ip}" title="삭제">
-                        <i class="bi bi-trash"></i>
-                    </button>
-                </td>
-            </tr>
-        `;
-    });
+        // 보정된 높이로 보이는 범위가 달라졌으면 한 번 더 렌더링
+        const range = getVisibleRange();
+        if (range.start !== start || range.end !== end) {
+            renderedRange = null;
+            scheduleRenderRows();
+        }
+    }
+}
+
+// 현재 스크롤 위치에서 렌더링할 행 범위 계산 (위아래로 여유 행 포함)
+function getVisibleRange() {
+    const container = document.getElementById('devices-scroll');
+    const headerHeight = document.getElementById('devices-table').tHead.offsetHeight;
     
-    tbody.innerHTML = html;
+    const viewTop = Math.max(0, container.scrollTop - headerHeight);
+    const viewBottom = viewTop + container.clientHeight;
     
-    // 행 클릭 이벤트 등록
-    document.querySelectorAll('.clickable-row').forEach(row => {
-        row.addEventListener('click', function(e) {
-            // 버튼 클릭은 무시
-            if (e.target.closest('button')) {
-                return;
-            }
-            
-            const ip = this.getAttribute('data-ip');
-            showDeviceDetails(ip);
-        });
-    });
+    return {
+        start: Math.max(0, findRowIndex(viewTop) - ROW_OVERSCAN),
+        end: Math.min(visibleDevices.length, findRowIndex(viewBottom) + 1 + ROW_OVERSCAN)
+    };
+}
+
+// 렌더링되지 않은 행의 높이를 대신하는 빈 행 생성
+function createSpacerRow(height) {
+    const row = document.createElement('tr');
+    row.className = 'virtual-spacer';
     
-    // 상세 정보 버튼 이벤트 등록
-    document.querySelectorAll('.view-device').forEach(btn => {
-        btn.addEventListener('click', function(e) {
-            e.stopPropagation();
-            const ip = this.getAttribute('data-ip');
-            showDeviceDetails(ip);
-        });
-    });
+    const cell = document.createElement('td');
+    cell.colSpan = 8;
+    cell.style.height = `${height}px`;
+    row.appendChild(cell);
     
-    // 삭제 버튼 이벤트 등록
-    document.querySelectorAll('.delete-device').forEach(btn => {
-        btn.addEventListener('click', function(e) {
-            e.stopPropagation();
-            const ip = this.getAttribute('data-ip');
-            const device = devices.find(d => d.ip === ip);
-            
-            if (confirm(`정말로 "${device.name || device.ip}" 장치를 삭제하시겠습니까?`)) {
-                deleteDevice(ip);
-            }
-        });
-    });
+    return row;
+}
+
+// 장치 목록 클릭 처리 (행, 상세 정보 버튼, 삭제 버튼)
+function handleDeviceListClick(e) {
+    const row = e.target.closest('.clickable-row');
+    if (!row) {
+        return;
+    }
+    
+    const ip = row.getAttribute('data-ip');
+    
+    // 삭제 버튼
+    if (e.target.closest('.delete-device')) {
+        const device = devices.find(d => d.ip === ip);
+        
+        if (confirm(`정말로 "${device.name || device.ip}" 장치를 삭제하시겠습니까?`)) {
+            deleteDevice(ip);
+        }
+        return;
+    }
+    
+    // 상세 정보 버튼 또는 행 클릭 (그 외 버튼 클릭은 무시)
+    if (e.target.closest('.view-device') || !e.target.closest('button')) {
+        showDeviceDetails(ip);
+    }
 }
 
 // 장치 삭제
@@ -275,74 +484,50 @@ function deleteDevice(ip) {
 
 // 토너 상태 HTML 생성
 function generateTonerHtml(toner) {
-    let html = '';
-    
     // 블랙 토너
-    const blackPercent = toner.black.percent;
-    let blackClass = 'toner-black';
-    if (blackPercent <= 10) {
-        blackClass += ' toner-danger';
-    } else if (blackPercent <= 20) {
-        blackClass += ' toner-warning';
-    }
-    
-    html += `
-        <div class="toner-bar">
-            <div class="toner-level ${blackClass}" style="width: ${blackPercent}%">
-                ${blackPercent}%
-            </div>
-        </div>
-    `;
+    let html = generateTonerBarHtml(toner.black.percent, 'toner-black');
     
     // 컬러 토너가 있는 경우
     if (toner.cyan.percent > 0 || toner.magenta.percent > 0 || toner.yellow.percent > 0) {
-        // 시안 토너
-        const cyanPercent = toner.cyan.percent;
-        let cyanClass = 'toner-cyan';
-        if (cyanPercent <= 10) {
-            cyanClass += ' toner-danger';
-        } else if (cyanPercent <= 20) {
-            cyanClass += ' toner-warning';
-        }
-        
-        // 마젠타 토너
-        const magentaPercent = toner.magenta.percent;
-        let magentaClass = 'toner-magenta';
-        if (magentaPercent <= 10) {
-            magentaClass += ' toner-danger';
-        } else if (magentaPercent <= 20) {
-            magentaClass += ' toner-warning';
-        }
-        
-        // 옐로우 토너
-        const yellowPercent = toner.yellow.percent;
-        let yellowClass = 'toner-yellow';
-        if (yellowPercent <= 10) {
-            yellowClass += ' toner-danger';
-        } else if (yellowPercent <= 20) {
-            yellowClass += ' toner-warning';
-        }
-        
-        html += `
-            <div class="toner-bar">
-                <div class="toner-level ${cyanClass}" style="width: ${cyanPercent}%">
-                    ${cyanPercent}%
-                </div>
-            </div>
-            <div class="toner-bar">
-                <div class="toner-level ${magentaClass}" style="width: ${magentaPercent}%">
-                    ${magentaPercent}%
-                </div>
-            </div>
+        html += generateTonerBarHtml(toner.cyan.percent, 'toner-cyan');
+        html += generateTonerBarHtml(toner.magenta.percent, 'toner-magenta');
+        html += generateTonerBarHtml(toner.yellow.percent, 'toner-yellow');
+    }
+    
+    return html;
+}
+
+// 토너 막대 HTML 생성 (조회 실패로 값이 없으면 '-' 표시)
+function generateTonerBarHtml(percent, tonerClass) {
+    if (percent === null || percent === undefined) {
+        return `
             <div class="toner-bar">
-                <div class="toner-level ${yellowClass}" style="width: ${yellowPercent}%">
-                    ${yellowPercent}%
-                </div>
+                <div class="toner-level ${tonerClass}" style="width: 0%">-</div>
             </div>
         `;
     }
     
-    return html;
+    if (percent <= 10) {
+        tonerClass += ' toner-danger';
+    } else if (percent <= 20) {
+        tonerClass += ' toner-warning';
+    }
+    
+    return `
+        <div class="toner-bar">
+            <div class="toner-level ${tonerClass}" style="width: ${percent}%">
+                ${percent}%
+            </div>
+        </div>
+    `;
+}
+
+// 토너 상세 값 표시 문자열 (조회 실패 시 '알 수 없음')
+function formatTonerDetail(toner) {
+    if (toner.percent === null || toner.percent === undefined) {
+        return '알 수 없음';
+    }
+    return `${toner.level} / ${toner.max} (${toner.percent}%)`;
 }
 
 // 장치 상세 정보 표시
@@ -468,7 +653,7 @@ function displayDeviceDetails(device) {
                     <div class="info-item">
                         <div class="row">
                             <div class="col-5 info-label">페이지 수</div>
-                            <div class="col-7">${device.page_count.toLocaleString()}</div>
+                            <div class="col-7">${device.page_count !== null && device.page_count !== undefined ? device.page_count.toLocaleString() : '알 수 없음'}</div>
                         </div>
                     </div>
                     <div class="info-item">
@@ -489,25 +674,25 @@ function displayDeviceDetails(device) {
                         <div class="info-item">
                             <div class="row">
                                 <div class="col-5 info-label">검정 토너</div>
-                                <div class="col-7">${device.toner.black.level} / ${device.toner.black.max} (${device.toner.black.percent}%)</div>
+                                <div class="col-7">${formatTonerDetail(device.toner.black)}</div>
                             </div>
                         </div>
                         <div class="info-item">
                             <div class="row">
                                 <div class="col-5 info-label">시안 토너</div>
-                                <div class="col-7">${device.toner.cyan.level} / ${device.toner.cyan.max} (${device.toner.cyan.percent}%)</div>
+                                <div class="col-7">${formatTonerDetail(device.toner.cyan)}</div>
                             </div>
                         </div>
                         <div class="info-item">
                             <div class="row">
                                 <div class="col-5 info-label">마젠타 토너</div>
-                                <div class="col-7">${device.toner.magenta.level} / ${device.toner.magenta.max} (${device.toner.magenta.percent}%)</div>
+                                <div class="col-7">${formatTonerDetail(device.toner.magenta)}</div>
                             </div>
                         </div>
                         <div class="info-item">
                             <div class="row">
                                 <div class="col-5 info-label">옐로우 토너</div>
-                                <div class="col-7">${device.toner.yellow.level} / ${device.toner.yellow.max} (${device.toner.yellow.percent}%)</div>
+                                <div class="col-7">${formatTonerDetail(device.toner.yellow)}</div>
                             </div>
                         </div>
                     </div>
@@ -534,6 +719,15 @@ function displayDeviceDetails(device) {
     });
 }
 
+// 장치 필터링 예약 (입력이 멈춘 뒤 한 번만 실행)
+function scheduleFilterDevices() {
+    clearTimeout(filterTimer);
+    filterTimer = setTimeout(() => {
+        document.getElementById('devices-scroll').scrollTop = 0;
+        filterDevices();
+    }, FILTER_DEBOUNCE_MS);
+}
+
 // 장치 필터링
 function filterDevices() {
     const searchTerm = document.getElementById('search-input').value.toLowerCase();
@@ -556,11 +750,8 @@ function filterDevices() {
 
 // Excel로 내보내기
 function exportToExcel() {
-    // 현재 표시된 장치 목록 가져오기
-    const rows = document.querySelectorAll('#devices-list tr');
-    
-    // 데이터가 없는 경우
-    if (rows.length === 0 || (rows.length === 1 && rows[0].cells.length === 1)) {
+    // 데이터가 없는 경우 (현재 필터 기준)
+    if (visibleDevices.length === 0) {
         alert('내보낼 데이터가 없습니다.');
         return;
     }
@@ -575,13 +766,13 @@ function exportToExcel() {
         const model = device.model.replace(/,/g, ' ');
         const serial = device.serial.replace(/,/g, ' ');
         const ip = device.ip;
-        const blackToner = device.toner.black.percent;
-        const cyanToner = device.toner.cyan.percent;
-        const magentaToner = device.toner.magenta.percent;
-        const yellowToner = device.toner.yellow.percent;
-        const pageCount = device.page_count;
+        const blackToner = device.toner.black.percent !== null ? `${device.toner.black.percent}%` : '';
+        const cyanToner = device.toner.cyan.percent !== null ? `${device.toner.cyan.percent}%` : '';
+        const magentaToner = device.toner.magenta.percent !== null ? `${device.toner.magenta.percent}%` : '';
+        const yellowToner = device.toner.yellow.percent !== null ? `${device.toner.yellow.percent}%` : '';
+        const pageCount = device.page_count !== null ? device.page_count : '';
         
-        csv += `${status},${index + 1},${name},${model},${serial},${ip},${blackToner}%,${cyanToner}%,${magentaToner}%,${yellowToner}%,${pageCount}\n`;
+        csv += `${status},${index + 1},${name},${model},${serial},${ip},${blackToner},${cyanToner},${magentaToner},${yellowToner},${pageCount}\n`;
     });
     
     // CSV 파일 다운로드
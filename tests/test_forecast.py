@@ -0,0 +1,97 @@
+from forecast import SupplyForecaster
+
+DAY = 86400
+
+
+def make_device(black, page_count):
+    """스캐너 반환 형식의 장치 정보 생성 (흑백 장치, 조회 실패 값은 None)"""
+    toner = {color: {'level': None, 'max': None, 'percent': None}
+             for color in SupplyForecaster.SUPPLIES}
+    toner['black'] = {'level': black, 'max': 100, 'percent': black}
+    return {'toner': toner, 'page_count': page_count}
+
+
+def test_failed_read_does_not_break_series():
+    forecaster = SupplyForecaster()
+    forecaster.add_sample('10.0.0.1', make_device(80, 1000), timestamp=0)
+    forecaster.add_sample('10.0.0.1', make_device(78, 1200), timestamp=1 * DAY)
+    forecaster.add_sample('10.0.0.1', make_device(76, 1400), timestamp=2 * DAY)
+
+    # SNMP 조회 실패: 스캐너는 토너 잔량과 인쇄 매수를 None으로 보고함
+    forecaster.add_sample('10.0.0.1', make_device(None, None), timestamp=2.5 * DAY)
+    result = forecaster.forecast_device('10.0.0.1')
+    assert result['supplies']['black']['days_to_empty'] == 38.0
+    assert result['pages_per_day'] == 200.0
+
+    # 다음 정상 스캔은 토너 교체나 카운터 초기화로 처리되지 않아야 함
+    forecaster.add_sample('10.0.0.1', make_device(74, 1600), timestamp=3 * DAY)
+    result = forecaster.forecast_device('10.0.0.1')
+    assert result['supplies']['black']['depletion_per_day'] == 2.0
+    assert result['supplies']['black']['samples'] == 4
+    assert result['pages_per_day'] == 200.0
+
+
+def test_short_span_reports_no_rate():
+    forecaster = SupplyForecaster()
+    forecaster.add_sample('10.0.0.1', make_device(50, 1000), timestamp=0)
+    forecaster.add_sample('10.0.0.1', make_device(49, 1001), timestamp=60)
+
+    result = forecaster.forecast_device('10.0.0.1')
+    assert result['supplies']['black']['depletion_per_day'] is None
+    assert result['supplies']['black']['days_to_empty'] is None
+    assert result['pages_per_day'] is None
+
+
+def test_sample_without_values_is_not_registered():
+    forecaster = SupplyForecaster()
+    forecaster.add_sample('10.0.0.1', make_device(None, None), timestamp=0)
+
+    assert forecaster.forecast_device('10.0.0.1') is None
+    assert forecaster.forecast() == {}
+
+
+def test_mono_device_reports_no_color_depletion():
+    forecaster = SupplyForecaster()
+    forecaster.add_sample('10.0.0.1', make_device(60, 1000), timestamp=0)
+    forecaster.add_sample('10.0.0.1', make_device(60, 1100), timestamp=2 * DAY)
+
+    supplies = forecaster.forecast_device('10.0.0.1')['supplies']
+    assert supplies['black']['depletion_per_day'] is None
+    assert supplies['cyan']['depletion_per_day'] is None
+
+
+def test_empty_cartridge_is_reported():
+    forecaster = SupplyForecaster()
+    forecaster.add_sample('10.0.0.1', make_device(4, 1000), timestamp=0)
+    forecaster.add_sample('10.0.0.1', make_device(2, 1200), timestamp=1 * DAY)
+    forecaster.add_sample('10.0.0.1', make_device(0, 1400), timestamp=2 * DAY)
+
+    black = forecaster.forecast_device('10.0.0.1')['supplies']['black']
+    assert black['percent'] == 0.0
+    assert black['days_to_empty'] == 0.0
+
+
+def test_forecast_device_matches_fleet_forecast():
+    forecaster = SupplyForecaster()
+    for i in range(3):
+        ip = f'10.0.0.{i}'
+        forecaster.add_sample(ip, make_device(90 - i, 1000), timestamp=0)
+        forecaster.add_sample(ip, make_device(80 - i, 1500 + i), timestamp=2 * DAY)
+
+    single = forecaster.forecast_device('10.0.0.1')
+    assert single == forecaster.forecast()['10.0.0.1']
+    assert forecaster.forecast_device('10.0.0.9') is None
+
+
+def test_state_round_trip():
+    forecaster = SupplyForecaster()
+    forecaster.add_sample('10.0.0.1', make_device(80, 1000), timestamp=0)
+    forecaster.add_sample('10.0.0.1', make_device(78, 1200), timestamp=1 * DAY)
+
+    restored = SupplyForecaster()
+    restored.load_state(forecaster.get_state())
+    restored.add_sample('10.0.0.1', make_device(76, 1400), timestamp=2 * DAY)
+
+    result = restored.forecast_device('10.0.0.1')
+    assert result['supplies']['black']['days_to_empty'] == 38.0
+    assert result['pages_per_day'] == 200.0
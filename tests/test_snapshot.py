@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+from forecast import SupplyForecaster
+from snapshot import SnapshotStore, default_snapshot_path, snapshot_path_from_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_device(ip, black):
+    """스캐너 반환 형식의 장치 정보 생성"""
+    toner = {color: {'level': None, 'max': None, 'percent': None}
+             for color in SupplyForecaster.SUPPLIES}
+    toner['black'] = {'level': black, 'max': 100, 'percent': black}
+    return {'ip': ip, 'name': ip, 'toner': toner, 'page_count': 1000}
+
+
+def test_legacy_list_snapshot_loads(tmp_path):
+    path = tmp_path / 'devices.json'
+    path.write_text(json.dumps([{'ip': '10.0.0.1', 'name': 'a'}, {'name': 'no ip'}]))
+
+    assert SnapshotStore(str(path)).load_devices() == [{'ip': '10.0.0.1', 'name': 'a'}]
+
+
+@pytest.mark.parametrize('content', ['{not json', '{"devices": 3}', '"text"'])
+def test_corrupted_snapshot_falls_back_to_empty(tmp_path, content):
+    path = tmp_path / 'devices.json'
+    path.write_text(content)
+    store = SnapshotStore(str(path))
+    forecaster = SupplyForecaster()
+
+    assert store.load_devices() == []
+    store.load_forecast(forecaster)
+    assert forecaster.forecast() == {}
+
+
+def test_journal_and_compaction_round_trip(tmp_path):
+    path = str(tmp_path / 'devices.json')
+    store = SnapshotStore(path, compact_every=3)
+    store.load_devices()
+
+    forecaster = SupplyForecaster()
+    for ip, black, t in [('10.0.0.1', 80, 0), ('10.0.0.2', 50, 0), ('10.0.0.1', 78, 86400)]:
+        device = make_device(ip, black)
+        forecaster.add_sample(ip, device, timestamp=t)
+        store.append_scan(ip, device, t)
+
+    # 압축 전: 저널만으로 복원
+    assert [d['ip'] for d in SnapshotStore(path).load_devices()] == ['10.0.0.1', '10.0.0.2']
+
+    assert store.needs_compaction()
+    assert store.compact([make_device('10.0.0.1', 78), make_device('10.0.0.2', 50)],
+                         forecaster.get_state())
+    assert os.path.getsize(store.journal_path) == 0
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+    # 압축 후 변경 사항은 다시 저널에 기록됨
+    forecaster.remove_device('10.0.0.2')
+    store.append_delete('10.0.0.2')
+
+    restored = SnapshotStore(path)
+    assert [d['ip'] for d in restored.load_devices()] == ['10.0.0.1']
+
+    restored_forecaster = SupplyForecaster()
+    restored.load_forecast(restored_forecaster)
+    assert restored_forecaster.forecast() == forecaster.forecast()
+
+
+def test_serverless_without_path_falls_back_to_temp(monkeypatch, capsys):
+    monkeypatch.delenv('SNAPSHOT_PATH', raising=False)
+    monkeypatch.setenv('VERCEL', '1')
+
+    assert snapshot_path_from_env() == default_snapshot_path()
+    assert '경고' in capsys.readouterr().out
+
+
+def test_snapshot_path_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv('SNAPSHOT_PATH', str(tmp_path / 'devices.json'))
+
+    assert snapshot_path_from_env() == str(tmp_path / 'devices.json')
+
+
+def test_app_import_skips_heavy_modules(tmp_path):
+    pytest.importorskip('flask')
+    code = (
+        "import sys, json, app\n"
+        "heavy = [m for m in ('scanner', 'forecast', 'puresnmp', 'requests', 'numpy') if m in sys.modules]\n"
+        "print(json.dumps(heavy))\n"
+    )
+    env = dict(os.environ, SNAPSHOT_PATH=str(tmp_path / 'devices.json'))
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []